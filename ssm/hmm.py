@@ -155,7 +155,8 @@ class HMM(object):
         self.transitions.permute(perm)
         self.observations.permute(perm)
 
-    def sample(self, T, prefix=None, input=None, tag=None, with_noise=True):
+    def sample(self, T, prefix=None, input=None, tag=None, with_noise=True,
+               batch_rollout=False):
         """
         Sample synthetic data from the model. Optionally, condition on a given
         prefix (preceding discrete states and data).
@@ -179,6 +180,17 @@ class HMM(object):
         with_noise : bool
             Whether or not to sample data with noise.
 
+        batch_rollout : bool
+            If True, draw the entire discrete state path up front and fill in
+            the observations with one call to ``observations.sample_x_batch``.
+            This is much faster for long time series, but it only applies when
+            the transition probabilities do not depend on the sampled data
+            (stationary, sticky, or input-driven transitions) and the
+            observation model provides ``sample_x_batch``; otherwise we fall
+            back on the sequential sampler.  The batched draws match the
+            sequential sampler in distribution, but they consume the random
+            stream in a different order.
+
         Returns
         -------
         z_sample : array_like of type int
@@ -232,11 +244,33 @@ class HMM(object):
             input = np.zeros((T+pad,) + M) if input is None else np.concatenate((np.zeros((pad,) + M), input))
             mask = np.ones((T+pad,) + D, dtype=bool)
 
+        # The batched rollout is only valid when the transition probabilities
+        # do not depend on the sampled data.  The recurrent models subclass
+        # the input-driven ones, so check the types exactly.
+        _data_free_transitions = (trans.StationaryTransitions,
+                                  trans.ConstrainedStationaryTransitions,
+                                  trans.StickyTransitions,
+                                  trans.InputDrivenTransitions)
+        use_batch_rollout = batch_rollout \
+            and type(self.transitions) in _data_free_transitions \
+            and hasattr(self.observations, "sample_x_batch")
+
         # Fill in the rest of the data
-        for t in range(pad, pad+T):
-            Pt = self.transitions.transition_matrices(data[t-1:t+1], input[t-1:t+1], mask=mask[t-1:t+1], tag=tag)[0]
-            z[t] = npr.choice(self.K, p=Pt[z[t-1]])
-            data[t] = self.observations.sample_x(z[t], data[:t], input=input[t], tag=tag, with_noise=with_noise)
+        if use_batch_rollout and T > 0:
+            # Draw the discrete state path first, then roll out the
+            # observations in one batched pass.
+            Ps = self.transitions.transition_matrices(
+                data[pad-1:pad+T], input[pad-1:pad+T], mask=mask[pad-1:pad+T], tag=tag)
+            for t in range(pad, pad+T):
+                Pt = Ps[t-pad] if Ps.shape[0] > 1 else Ps[0]
+                z[t] = npr.choice(self.K, p=Pt[z[t-1]])
+            data[pad:pad+T] = self.observations.sample_x_batch(
+                z[pad:pad+T], data[:pad], input=input[pad:pad+T], tag=tag, with_noise=with_noise)
+        else:
+            for t in range(pad, pad+T):
+                Pt = self.transitions.transition_matrices(data[t-1:t+1], input[t-1:t+1], mask=mask[t-1:t+1], tag=tag)[0]
+                z[t] = npr.choice(self.K, p=Pt[z[t-1]])
+                data[t] = self.observations.sample_x(z[t], data[:t], input=input[t], tag=tag, with_noise=with_noise)
 
         # Return the whole data if no prefix is given.
         # Otherwise, just return the simulated part.
@@ -1,6 +1,13 @@
 import copy
 import warnings
-
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numba
+import numpy
+from scipy.linalg import cho_factor, cho_solve
+from scipy.linalg.blas import dsyrk
+from scipy.linalg.lapack import dposv
 import autograd.numpy as np
 import autograd.numpy.random as npr
 
@@ -9,12 +16,197 @@ from autograd.scipy.special import logsumexp
 
 from ssm.util import random_rotation, ensure_args_are_lists, \
     logistic, logit, one_hot
-from ssm.regression import fit_linear_regression, generalized_newton_studentst_dof
+from ssm.regression import fit_linear_regression, generalized_newton_studentst_dof_batched
 from ssm.preprocessing import interpolate_data
 from ssm.cstats import robust_ar_statistics
 from ssm.optimizers import adam, bfgs, rmsprop, sgd, lbfgs
 import ssm.stats as stats
 
+@numba.jit(nopython=True, cache=True, parallel=True)
+def _weighted_ar_statistics(x, y, w):
+    """
+    Accumulate the weighted least squares statistics
+
+        J[k] = \sum_t w[t, k] x[t] x[t]^T
+        h[k] = \sum_t w[t, k] y[t] x[t]
+
+    with scalar loops so that no (T, P, P) broadcast temporary is
+    materialized.  Only the upper triangle of each J[k] is computed;
+    the lower triangle is filled in by symmetry.
+
+    x: (T, P)  y: (T,)  w: (T, K)  ->  J: (K, P, P)  h: (K, P)
+    """
+    T, P = x.shape
+    K = w.shape[1]
+    J = numpy.zeros((K, P, P))
+    h = numpy.zeros((K, P))
+    for k in numba.prange(K):
+        for t in range(T):
+            wt = w[t, k]
+            for i in range(P):
+                wxi = wt * x[t, i]
+                h[k, i] += wxi * y[t]
+                for j in range(i, P):
+                    J[k, i, j] += wxi * x[t, j]
+        for i in range(P):
+            for j in range(i + 1, P):
+                J[k, j, i] = J[k, i, j]
+    return J, h
+
+
+def _symmetric_weighted_gram(x, w):
+    """
+    Compute the weighted Gram matrices J[k] = \sum_t w[t, k] x[t] x[t]^T
+    with rank-k updates (dsyrk), which touch only the upper triangle and
+    therefore do half the flops of a full GEMM.  The result is symmetrized
+    before returning.
+
+    x: (T, P)  w: (T, K)  ->  J: (K, P, P)
+    """
+    T, P = x.shape
+    K = w.shape[1]
+    J = numpy.empty((K, P, P))
+    sqrt_w = numpy.sqrt(w)
+    for k in range(K):
+        Jk = dsyrk(1.0, sqrt_w[:, k:k+1] * x, trans=1)
+        J[k] = Jk + Jk.T - numpy.diag(numpy.diag(Jk))
+    return J
+
+
+@numba.jit(nopython=True, cache=True, parallel=True)
+def _alt_robust_expected_tau(x, y, Afull, sigmasq, nus):
+    """
+    E-step precision weights of the alternative robust AR model,
+
+        tau[t, k, d] = (nu[k, d]/2 + 1/2) / (nu[k, d]/2 + r^2 / (2 sigma^2))
+
+    with r = y[t, d] - Afull[k, d] @ x[t], computed in one streaming pass
+    over t so the (T, K, D) mean, alpha, and beta temporaries are never
+    materialized.
+
+    x: (T, P)  y: (T, D)  Afull: (K, D, P)  sigmasq, nus: (K, D)  ->  (T, K, D)
+    """
+    T, P = x.shape
+    K, D = nus.shape
+    tau = numpy.empty((T, K, D))
+    for t in numba.prange(T):
+        for k in range(K):
+            for d in range(D):
+                mu = 0.0
+                for p in range(P):
+                    mu += Afull[k, d, p] * x[t, p]
+                r = y[t, d] - mu
+                beta = nus[k, d] / 2 + 0.5 * r * r / sigmasq[k, d]
+                tau[t, k, d] = (nus[k, d] / 2 + 0.5) / beta
+    return tau
+
+
+@numba.jit(nopython=True, cache=True)
+def _ar_sample_trajectory(zs, xs, input, As, Vs, bs, mu_init, S_init, S,
+                          noise, scale, pad, lags):
+    """
+    Run the sequential AR sampling recursion
+
+        xs[i] = b[z] + V[z] u[t] + A[z] xs[i-lags:i][::-1] + scale[t] S[z] e[t]
+
+    entirely inside one jitted loop, so a long rollout pays no per-step
+    NumPy dispatch.  The first lags steps draw from the initial
+    distribution.  xs holds the history prefix of length pad followed by T
+    slots to fill; noise is the pre-drawn (T, D) standard normal block and
+    scale a per-step factor on the noise (1 for Gaussian models, 1/sqrt(tau)
+    for the Student's t models).
+    """
+    T = zs.shape[0]
+    D = xs.shape[1]
+    M = input.shape[1]
+    for t in range(T):
+        z = zs[t]
+        i = pad + t
+        if i < lags:
+            for d in range(D):
+                v = mu_init[z, d]
+                for e in range(D):
+                    v += S_init[z, d, e] * noise[t, e]
+                xs[i, d] = v
+        else:
+            for d in range(D):
+                v = bs[z, d]
+                for m in range(M):
+                    v += Vs[z, d, m] * input[t, m]
+                for l in range(lags):
+                    for e in range(D):
+                        v += As[z, d, l * D + e] * xs[i - l - 1, e]
+                for e in range(D):
+                    v += scale[t] * S[z, d, e] * noise[t, e]
+                xs[i, d] = v
+    return xs
+
+
+@numba.jit(nopython=True, cache=True, parallel=True)
+def _alt_robust_nu_statistics(Ez, y, mus, half_nus, inv_sigmasq, digamma_alpha):
+    """
+    Accumulate the expected sufficient statistics for the Student's t
+    degrees-of-freedom update,
+
+        E_taus[k, d]    = \sum_t Ez[t, k] * alpha[k, d] / beta[t, k, d]
+        E_logtaus[k, d] = \sum_t Ez[t, k] * (digamma(alpha[k, d]) - log(beta[t, k, d]))
+
+    with beta computed inline from the residuals, so the reductions make a
+    single pass over the data instead of materializing beta and reducing it
+    three times.
+
+    Ez: (T, K)  y: (T, D)  mus: (T, K, D)  rest: (K, D)  ->  (K, D), (K, D)
+    """
+    T, K = Ez.shape
+    D = y.shape[1]
+    E_taus = numpy.zeros((K, D))
+    E_logtaus = numpy.zeros((K, D))
+    for k in numba.prange(K):
+        for t in range(T):
+            w = Ez[t, k]
+            for d in range(D):
+                r = y[t, d] - mus[t, k, d]
+                beta = half_nus[k, d] + 0.5 * r * r * inv_sigmasq[k, d]
+                E_taus[k, d] += w * (half_nus[k, d] + 0.5) / beta
+                E_logtaus[k, d] += w * (digamma_alpha[k, d] - numpy.log(beta))
+    return E_taus, E_logtaus
+
+
+@numba.jit(nopython=True, cache=True, parallel=True)
+def _diagonal_ar_compute_mus(data, input, As, bs, Vs, mu_init, lags):
+    """
+    Conditional means of a diagonal AR model,
+
+        mus[t, k, d] = b[k, d] + \sum_m V[k, d, m] u[t, m]
+                               + \sum_l A[k, d, l] x[t-l-1, d]
+
+    with the first `lags` steps pinned to the initial mean.  The kernel is
+    pure elementwise multiply-accumulate, so explicit loops avoid the
+    (T, K, D) broadcast temporaries that each += would create.
+
+    data: (T, D)  input: (T, M)  As: (K, D, L)  bs: (K, D)  Vs: (K, D, M)
+    """
+    T, D = data.shape
+    K = bs.shape[0]
+    M = input.shape[1]
+    mus = numpy.empty((T, K, D))
+    for t in numba.prange(T):
+        if t < lags:
+            for k in range(K):
+                for d in range(D):
+                    mus[t, k, d] = mu_init[k, d]
+        else:
+            for k in range(K):
+                for d in range(D):
+                    s = bs[k, d]
+                    for m in range(M):
+                        s += Vs[k, d, m] * input[t, m]
+                    for l in range(lags):
+                        s += As[k, d, l] * data[t-l-1, d]
+                    mus[t, k, d] = s
+    return mus
+
+
 class Observations(object):
     # K = number of discrete states
     # D = number of observed dimensions
@@ -379,21 +571,25 @@ class StudentsTObservations(Observations):
         E_taus = np.zeros((K, D))
         E_logtaus = np.zeros((K, D))
         weights = np.zeros(K)
+        # The parameters are constant over the dataset loop, so broadcast
+        # them (and the digamma evaluation) once up front
+        half_nus = self.nus / 2
+        alpha = half_nus + 1/2
+        inv_sigmasq = 1 / self.sigmasq
+        digamma_alpha = digamma(alpha)
         for y, (Ez, _, _) in zip(datas, expectations):
             # nu: (K,D)  mus: (K, D)  sigmas: (K, D)  y: (T, D)  -> alpha/beta: (T, K, D)
-            alpha = self.nus/2 + 1/2
-            beta = self.nus/2 + 1/2 * (y[:, None, :] - self.mus)**2 / self.sigmasq
+            beta = half_nus + 1/2 * (y[:, None, :] - self.mus)**2 * inv_sigmasq
 
             E_taus += np.sum(Ez[:, :, None] * (alpha / beta), axis=0)
-            E_logtaus += np.sum(Ez[:, :, None] * (digamma(alpha) - np.log(beta)), axis=0)
+            E_logtaus += np.sum(Ez[:, :, None] * (digamma_alpha - np.log(beta)), axis=0)
             weights += np.sum(Ez, axis=0)
 
         E_taus /= weights[:, None]
         E_logtaus /= weights[:, None]
 
-        for k in range(K):
-            for d in range(D):
-                self._log_nus[k, d] = np.log(generalized_newton_studentst_dof(E_taus[k, d], E_logtaus[k, d]))
+        # One batched Newton iteration over all (k, d) entries at once
+        self._log_nus = np.log(generalized_newton_studentst_dof_batched(E_taus, E_logtaus))
 
 
 class MultivariateStudentsTObservations(Observations):
@@ -505,20 +701,22 @@ class MultivariateStudentsTObservations(Observations):
         E_taus = np.zeros(K)
         E_logtaus = np.zeros(K)
         weights = np.zeros(K)
+        half_nus = self.nus / 2
+        alpha = half_nus + D/2
+        digamma_alpha = digamma(alpha)
         for y, (Ez, _, _) in zip(datas, expectations):
             # nu: (K,)  mus: (K, D)  Sigmas: (K, D, D)  y: (T, D)  -> alpha/beta: (T, K)
-            alpha = self.nus/2 + D/2
-            beta = self.nus/2 + 1/2 * stats.batch_mahalanobis(self._sqrt_Sigmas, y[:, None, :] - self.mus)
+            beta = half_nus + 1/2 * stats.batch_mahalanobis(self._sqrt_Sigmas, y[:, None, :] - self.mus)
 
             E_taus += np.sum(Ez * (alpha / beta), axis=0)
-            E_logtaus += np.sum(Ez * (digamma(alpha) - np.log(beta)), axis=0)
+            E_logtaus += np.sum(Ez * (digamma_alpha - np.log(beta)), axis=0)
             weights += np.sum(Ez, axis=0)
 
         E_taus /= weights
         E_logtaus /= weights
 
-        for k in range(K):
-            self._log_nus[k] = np.log(generalized_newton_studentst_dof(E_taus[k], E_logtaus[k]))
+        # One batched Newton iteration over all states at once
+        self._log_nus = np.log(generalized_newton_studentst_dof_batched(E_taus, E_logtaus))
 
     def sample_x(self, z, xhist, input=None, tag=None, with_noise=True):
         D, mus, Sigmas, nus = self.D, self.mus, self.Sigmas, self.nus
@@ -731,30 +929,85 @@ class _AutoRegressiveObservationsBase(Observations):
         self.bs = self.bs[perm]
         self.Vs = self.Vs[perm]
 
+    # Bound on the number of per-dataset entries the lagged-data and
+    # design-matrix caches retain.  Fits over at most this many datasets
+    # reuse the stacked matrices across EM iterations; beyond it the oldest
+    # entries are evicted, so a long-lived model scoring a stream of fresh
+    # arrays degrades to the uncached behavior instead of pinning every
+    # dataset it has ever seen.
+    _MAX_CACHED_DATASETS = 32
+
+    def _lagged_data(self, data):
+        """
+        Stack the lagged data [x_{t-1}, ..., x_{t-L}] into a single
+        (T-L, L*D) design matrix.  The result is cached per dataset (keyed by
+        the data array itself, in a small LRU) and forced C-contiguous, so
+        repeated EM iterations over the same datasets stream row-major into
+        the GEMMs without rebuilding the stack.
+        """
+        if not isinstance(data, numpy.ndarray):
+            # data is an autograd tracer (e.g. a differentiated latent
+            # sample in a variational fit): skip the cache and the
+            # contiguity forcing, which has no VJP
+            if self.lags == 1:
+                return data[:-1]
+            return np.hstack([data[self.lags-l-1:-l-1] for l in range(self.lags)])
+
+        cache = self.__dict__.setdefault("_lag_cache", OrderedDict())
+        entry = cache.get(id(data))
+        if entry is None or entry[0] is not data:
+            if self.lags == 1:
+                # single-lag design matrix is just a view of the data
+                X = numpy.ascontiguousarray(data[:-1])
+            else:
+                X = numpy.ascontiguousarray(
+                    numpy.hstack([data[self.lags-l-1:-l-1] for l in range(self.lags)]))
+            cache[id(data)] = entry = (data, X)
+            if len(cache) > self._MAX_CACHED_DATASETS:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(id(data))
+        return entry[1]
+
+    def _design_matrix(self, data, input):
+        """
+        Build the design matrix [x_{t-1}, ..., x_{t-L}, u_t, 1] for the AR
+        M step, caching it per (data, input) pair in the same bounded LRU
+        fashion as _lagged_data.
+        """
+        cache = self.__dict__.setdefault("_design_cache", OrderedDict())
+        entry = cache.get(id(data))
+        if entry is None or entry[0] is not data or entry[1] is not input:
+            X = np.ascontiguousarray(
+                np.hstack([self._lagged_data(data),
+                           input[self.lags:, :self.M],
+                           np.ones((data.shape[0]-self.lags, 1))]))
+            cache[id(data)] = entry = (data, input, X)
+            if len(cache) > self._MAX_CACHED_DATASETS:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(id(data))
+        return entry[2]
+
     def _compute_mus(self, data, input, mask, tag):
         # assert np.all(mask), "ARHMM cannot handle missing data"
         K, M = self.K, self.M
         T, D = data.shape
         As, bs, Vs, mu0s = self.As, self.bs, self.Vs, self.mu_init
 
-        # Instantaneous inputs
-        mus = np.empty((K, T, D))
-        mus = []
-        for k, (A, b, V, mu0) in enumerate(zip(As, bs, Vs, mu0s)):
-            # Initial condition
-            mus_k_init = mu0 * np.ones((self.lags, D))
-
-            # Subsequent means are determined by the AR process
-            mus_k_ar = np.dot(input[self.lags:, :M], V.T)
-            for l in range(self.lags):
-                Al = A[:, l*D:(l + 1)*D]
-                mus_k_ar = mus_k_ar + np.dot(data[self.lags-l-1:-l-1], Al.T)
-            mus_k_ar = mus_k_ar + b
+        # Initial conditions, as a broadcast view; the concatenate below
+        # writes it into the output without an intermediate copy
+        mus_init = np.broadcast_to(mu0s[:, None, :], (K, self.lags, D))
 
-            # Append concatenated mean
-            mus.append(np.vstack((mus_k_init, mus_k_ar)))
+        # Subsequent means are determined by the AR process.  Stack the lagged
+        # data into one design matrix so all K states are handled by a single
+        # batched matmul rather than K small GEMMs.
+        X_lag = self._lagged_data(data)
+        mus_ar = np.matmul(X_lag, np.swapaxes(As, 1, 2)) \
+            + np.matmul(input[self.lags:, :M], np.swapaxes(Vs, 1, 2)) \
+            + bs[:, None, :]
 
-        return np.array(mus)
+        return np.concatenate((mus_init, mus_ar), axis=1)
 
     def smooth(self, expectations, data, input, tag):
         """
@@ -797,6 +1050,24 @@ class AutoRegressiveObservations(_AutoRegressiveObservationsBase):
         self.l2_penalty_b = l2_penalty_b
         self.l2_penalty_V = l2_penalty_V
 
+    def _get_cached(self, key, fn):
+        """
+        Cache expensive functions of the parameters, like Cholesky factors
+        and inverses of the covariance matrices.  These are typically needed
+        once per EM iteration, but the methods that use them may be called
+        many times.  The cache is invalidated whenever a parameter array is
+        replaced, e.g. by the params setter or the M step.
+        """
+        cache = self.__dict__.setdefault("_cache", {})
+        params = cache.get("_params")
+        if params is None or len(params) != len(self.params) or \
+                any(p is not q for p, q in zip(params, self.params)):
+            cache.clear()
+            cache["_params"] = self.params
+        if key not in cache:
+            cache[key] = fn()
+        return cache[key]
+
     @property
     def A(self):
         return self.As[0]
@@ -817,17 +1088,35 @@ class AutoRegressiveObservations(_AutoRegressiveObservationsBase):
 
     @property
     def Sigmas_init(self):
-        return np.matmul(self._sqrt_Sigmas_init, np.swapaxes(self._sqrt_Sigmas_init, -1, -2))
+        # cached so repeated property accesses in the EM loop do not
+        # reallocate the (K, D, D) product
+        return self._get_cached(
+            "Sigmas_init",
+            lambda: np.matmul(self._sqrt_Sigmas_init,
+                              np.swapaxes(self._sqrt_Sigmas_init, -1, -2)))
 
     @property
     def Sigmas(self):
-        return np.matmul(self._sqrt_Sigmas, np.swapaxes(self._sqrt_Sigmas, -1, -2))
+        return self._get_cached(
+            "Sigmas",
+            lambda: np.matmul(self._sqrt_Sigmas,
+                              np.swapaxes(self._sqrt_Sigmas, -1, -2)))
 
     @Sigmas.setter
     def Sigmas(self, value):
         assert value.shape == (self.K, self.D, self.D)
         self._sqrt_Sigmas = np.linalg.cholesky(value)
 
+    @property
+    def _inv_Sigmas_init(self):
+        return self._get_cached("inv_Sigmas_init",
+                                lambda: np.linalg.inv(self.Sigmas_init))
+
+    @property
+    def _inv_Sigmas(self):
+        return self._get_cached("inv_Sigmas",
+                                lambda: np.linalg.inv(self.Sigmas))
+
     @property
     def params(self):
         return super(AutoRegressiveObservations, self).params + (self._sqrt_Sigmas,)
@@ -857,16 +1146,27 @@ class AutoRegressiveObservations(_AutoRegressiveObservationsBase):
         else:
             zs = [npr.choice(self.K, size=T-self.lags) for T in Ts]
 
-        # Initialize the weights with linear regression
-        Sigmas = []
-        for k in range(self.K):
-            ts = [np.where(z == k)[0] for z in zs]
+        # Partition the time bins by state with one stable sort per sequence
+        # rather than K boolean scans over each label array
+        perms = [np.argsort(z, kind="stable") for z in zs]
+        offsets = [np.searchsorted(z[perm], np.arange(self.K + 1))
+                   for z, perm in zip(zs, perms)]
+
+        # Initialize the weights with linear regression.  The K per-state
+        # regressions are independent, so solve them on a thread pool; the
+        # underlying lstsq calls release the GIL.
+        def _fit_state(k):
+            ts = [perm[off[k]:off[k+1]] for perm, off in zip(perms, offsets)]
             Xs = [np.column_stack([data[t + l] for l in range(self.lags)] + [input[t, :self.M]])
                   for t, data, input in zip(ts, datas, inputs)]
             ys = [data[t+self.lags] for t, data in zip(ts, datas)]
+            return fit_linear_regression(Xs, ys)
+
+        with ThreadPoolExecutor() as executor:
+            results = list(executor.map(_fit_state, range(self.K)))
 
-            # Solve the linear regression
-            coef_, intercept_, Sigma = fit_linear_regression(Xs, ys)
+        Sigmas = []
+        for k, (coef_, intercept_, Sigma) in enumerate(results):
             self.As[k] = coef_[:, :self.D * self.lags]
             self.Vs[k] = coef_[:, self.D * self.lags:]
             self.bs[k] = intercept_
@@ -880,15 +1180,20 @@ class AutoRegressiveObservations(_AutoRegressiveObservationsBase):
         L = self.lags
         mus = self._compute_mus(data, input, mask, tag)
 
-        # Compute the likelihood of the initial data and remainder separately
-        # stats.multivariate_studentst_logpdf supports broadcasting, but we get
-        # significant performance benefit if we call it with (TxD), (D,), (D,D), and (,)
-        # arrays as inputs
-        ll_init = np.column_stack([stats.multivariate_normal_logpdf(data[:L], mu[:L], Sigma)
-                               for mu, Sigma in zip(mus, self.Sigmas_init)])
+        # Compute the likelihood of the initial data and remainder separately,
+        # evaluating the Gaussian log density for all K states in one batched
+        # call.  The Cholesky factors of the covariances are cached so repeated
+        # calls with fixed parameters do not refactorize each Sigma.
+        Ls_init = self._get_cached("chol_Sigmas_init",
+                                   lambda: np.linalg.cholesky(self.Sigmas_init))
+        Ls = self._get_cached("chol_Sigmas",
+                              lambda: np.linalg.cholesky(self.Sigmas))
 
-        ll_ar = np.column_stack([stats.multivariate_normal_logpdf(data[L:], mu[L:], Sigma)
-                               for mu, Sigma in zip(mus, self.Sigmas)])
+        ll_init = stats._multivariate_normal_logpdf(
+            data[None, :L], mus[:, :L], self.Sigmas_init[:, None], Ls=Ls_init[:, None]).T
+
+        ll_ar = stats._multivariate_normal_logpdf(
+            data[None, L:], mus[:, L:], self.Sigmas[:, None], Ls=Ls[:, None]).T
 
         return np.row_stack((ll_init, ll_ar))
 
@@ -902,57 +1207,55 @@ class AutoRegressiveObservations(_AutoRegressiveObservationsBase):
             if not np.all(mask):
                 raise Exception("Encountered missing data in AutoRegressiveObservations!")
 
-            xs.append(
-                np.hstack([data[self.lags-l-1:-l-1] for l in range(self.lags)]
-                          + [input[self.lags:, :self.M], np.ones((data.shape[0]-self.lags, 1))]))
+            xs.append(self._design_matrix(data, input))
             ys.append(data[self.lags:])
             Ezs.append(Ez[self.lags:])
 
+        # Concatenate the datasets so the sufficient statistics are computed
+        # with a single contraction over one time axis.
+        x = np.concatenate(xs)
+        y = np.concatenate(ys)
+        Ez = np.concatenate(Ezs)
+
         # M step: Fit the weighted linear regressions for each K and D
         if J0 is None and h0 is None:
             J_diag = np.concatenate((self.l2_penalty_A * np.ones(D * lags),
                                  self.l2_penalty_V * np.ones(M),
                                  self.l2_penalty_b * np.ones(1)))
-            J = np.tile(np.diag(J_diag)[None, :, :], (K, 1, 1))
-            h = np.zeros((K, D * lags + M + 1, D))
+            # write the penalties straight onto the diagonals rather than
+            # tiling K dense copies of a mostly-zero matrix
+            P = D * lags + M + 1
+            J = np.zeros((K, P, P))
+            J[:, np.arange(P), np.arange(P)] = J_diag
+            h = np.zeros((K, P, D))
         else:
             assert J0.shape == (K, D*lags + M + 1, D*lags + M + 1)
             assert h0.shape == (K, D*lags + M + 1, D)
             J = J0
             h = h0
 
-        J_diag = np.concatenate((self.l2_penalty_A * np.ones(D * lags),
-                                 self.l2_penalty_V * np.ones(M),
-                                 self.l2_penalty_b * np.ones(1)))
-        J = np.tile(np.diag(J_diag)[None, :, :], (K, 1, 1))
-        h = np.zeros((K, D * lags + M + 1, D))
-        for x, y, Ez in zip(xs, ys, Ezs):
-            # Einsum is concise but slow!
-            # J += np.einsum('tk, ti, tj -> kij', Ez, x, x)
-            # h += np.einsum('tk, ti, td -> kid', Ez, x, y)
-            # Do weighted products for each of the k states
-            for k in range(K):
-                weighted_x = x * Ez[:, k:k+1]
-                J[k] += np.dot(weighted_x.T, x)
-                h[k] += np.dot(weighted_x.T, y)
+        # The symmetric Gram accumulation does half the flops via dsyrk;
+        # with optimize=True the h contraction reduces to a GEMM.
+        J = J + _symmetric_weighted_gram(x, Ez)
+        h = h + np.einsum('tk,ti,td->kid', Ez, x, y, optimize=True)
 
-        mus = np.linalg.solve(J, h)
+        # J is SPD by construction, so a Cholesky solve is ~2x faster and
+        # numerically safer than general LU
+        mus = np.array([cho_solve(cho_factor(Jk, lower=True), hk)
+                        for Jk, hk in zip(J, h)])
         self.As = np.swapaxes(mus[:, :D*lags, :], 1, 2)
         self.Vs = np.swapaxes(mus[:, D*lags:D*lags+M, :], 1, 2)
         self.bs = mus[:, -1, :]
 
-        # Update the covariance
-        sqerr = np.zeros((K, D, D))
-        weight = 1e-8 * np.ones(K)
-        for x, y, Ez in zip(xs, ys, Ezs):
-            yhat = np.matmul(x[None, :, :], mus)
-            resid = y[None, :, :] - yhat
-            sqerr += np.einsum('tk,kti,ktj->kij', Ez, resid, resid)
-            weight += np.sum(Ez, axis=0)
+        # Update the covariance with a batched GEMM over the weighted residuals
+        yhat = np.matmul(x, mus)
+        resid = y[None, :, :] - yhat
+        sqerr = np.matmul(np.swapaxes(resid * Ez.T[:, :, None], 1, 2), resid)
+        weight = 1e-8 + np.sum(Ez, axis=0)
         Sigmas = sqerr / weight[:, None, None] + 1e-8 * np.eye(D)
 
         # If any states are unused, set their parameters to a perturbation of a used state
-        usage = sum([Ez.sum(0) for Ez in Ezs])
+        usage = Ez.sum(0)
         unused = np.where(usage < 1)[0]
         used = np.where(usage > 1)[0]
         if len(unused) > 0:
@@ -970,19 +1273,59 @@ class AutoRegressiveObservations(_AutoRegressiveObservationsBase):
         D, As, bs, Vs = self.D, self.As, self.bs, self.Vs
 
         if xhist.shape[0] < self.lags:
-            # Sample from the initial distribution
-            S = np.linalg.cholesky(self.Sigmas_init[z]) if with_noise else 0
+            # Sample from the initial distribution.  The Cholesky factors are
+            # cached so long rollouts pay O(D^2) per step, not O(D^3).
+            if with_noise:
+                S = self._get_cached("chol_Sigmas_init",
+                                     lambda: np.linalg.cholesky(self.Sigmas_init))[z]
+            else:
+                S = 0
             return self.mu_init[z] + np.dot(S, npr.randn(D))
         else:
-            # Sample from the autoregressive distribution
-            mu = Vs[z].dot(input[:self.M]) + bs[z]
-            for l in range(self.lags):
-                Al = As[z][:,l*D:(l+1)*D]
-                mu += Al.dot(xhist[-l-1])
-
-            S = np.linalg.cholesky(self.Sigmas[z]) if with_noise else 0
+            # Sample from the autoregressive distribution.  Flattening the
+            # lagged history into one vector makes this a single GEMV.
+            mu = Vs[z].dot(input[:self.M]) + bs[z] \
+                + As[z].dot(xhist[-self.lags:][::-1].ravel())
+
+            if with_noise:
+                S = self._get_cached("chol_Sigmas",
+                                     lambda: np.linalg.cholesky(self.Sigmas))[z]
+            else:
+                S = 0
             return mu + np.dot(S, npr.randn(D))
 
+    def sample_x_batch(self, zs, xhist, input=None, tag=None, with_noise=True):
+        """
+        Sample a trajectory of observations for a fixed sequence of discrete
+        states.  The AR recursion is inherently sequential, but the Gaussian
+        noise for the whole trajectory is drawn in one block RNG call and
+        rotated by the cached per-state Cholesky factors, so each step of the
+        rollout costs a single GEMV.
+
+        zs: (T,) array of discrete states
+        xhist: (pad, D) array of preceding observations (may be empty)
+        """
+        T = len(zs)
+        D, As, bs, Vs, L = self.D, self.As, self.bs, self.Vs, self.lags
+        input = np.zeros((T, self.M)) if input is None else input
+
+        if with_noise:
+            S_init = self._get_cached("chol_Sigmas_init",
+                                      lambda: np.linalg.cholesky(self.Sigmas_init))
+            S = self._get_cached("chol_Sigmas",
+                                 lambda: np.linalg.cholesky(self.Sigmas))
+            noise = npr.randn(T, D)
+        else:
+            S_init = S = numpy.zeros((self.K, D, D))
+            noise = numpy.zeros((T, D))
+
+        pad = xhist.shape[0]
+        xs = np.concatenate((xhist, np.zeros((T, D))))
+        _ar_sample_trajectory(
+            numpy.asarray(zs), xs, numpy.ascontiguousarray(input[:, :self.M]),
+            As, Vs, bs, self.mu_init, S_init, S, noise, numpy.ones(T), pad, L)
+        return xs[pad:]
+
     def hessian_expected_log_dynamics_prob(self, Ez, data, input, mask, tag=None):
         assert np.all(mask), "Cannot compute Hessian of autoregressive obsevations with missing data."
         assert self.lags == 1, "Does not compute Hessian of autoregressive observations with lags > 1"
@@ -993,23 +1336,27 @@ class AutoRegressiveObservations(_AutoRegressiveObservationsBase):
         # diagonal blocks, size ((T, D, D))
         diagonal_blocks = np.zeros((T, D, D))
 
+        # inverse covariances are cached since they only change with the params
+        inv_Sigmas_init = self._inv_Sigmas_init
+        inv_Sigmas = self._inv_Sigmas
+
         # initial distribution contributes a Gaussian term to first diagonal block
-        diagonal_blocks[0] = -1 * np.sum(Ez[0, :, None, None] * np.linalg.inv(self.Sigmas_init), axis=0)
+        diagonal_blocks[0] = -1 * np.sum(Ez[0, :, None, None] * inv_Sigmas_init, axis=0)
 
         # first part is transition dynamics - goes to all terms except final one
         # E_q(z) x_{t} A_{z_t+1}.T Sigma_{z_t+1}^{-1} A_{z_t+1} x_{t}
-        inv_Sigmas = np.linalg.inv(self.Sigmas)
-        dynamics_terms = np.array([A.T@inv_Sigma@A for A, inv_Sigma in zip(self.As, inv_Sigmas)]) # A^T Qinv A terms
-        diagonal_blocks[:-1] += -1 * np.sum(Ez[1:,:,None,None] * dynamics_terms[None,:], axis=1)
+        # batched matmuls compute the A^T Qinv A terms for all states at once
+        off_diag_terms = np.matmul(inv_Sigmas, self.As)
+        dynamics_terms = np.matmul(np.swapaxes(self.As, -1, -2), off_diag_terms)
+        diagonal_blocks[:-1] += -1 * np.einsum('tk,kij->tij', Ez[1:], dynamics_terms, optimize=True)
 
         # second part of diagonal blocks are inverse covariance matrices - goes to all but first time bin
         # E_q(z) x_{t+1} Sigma_{z_t+1}^{-1} x_{t+1}
-        diagonal_blocks[1:] += -1 * np.sum(Ez[1:,:,None,None] * inv_Sigmas[None,:], axis=1)
+        diagonal_blocks[1:] += -1 * np.einsum('tk,kij->tij', Ez[1:], inv_Sigmas, optimize=True)
 
         # lower diagonal blocks are (T-1,D,D):
         # E_q(z) x_{t+1} Sigma_{z_t+1}^{-1} A_{z_t+1} x_t
-        off_diag_terms = np.array([inv_Sigma@A for A, inv_Sigma in zip(self.As, inv_Sigmas)])
-        lower_diagonal_blocks = np.sum(Ez[1:,:,None,None] * off_diag_terms[None,:], axis=1)
+        lower_diagonal_blocks = np.einsum('tk,kij->tij', Ez[1:], off_diag_terms, optimize=True)
 
         return diagonal_blocks, lower_diagonal_blocks
 
@@ -1071,6 +1418,9 @@ class AutoRegressiveDiagonalNoiseObservations(AutoRegressiveObservations):
         assert value.shape == (self.K, self.D)
         assert np.all(value > 0)
         self._log_sigmasq_init = np.log(value)
+        # the initial variances are not part of params, so drop any cached
+        # matrices derived from them explicitly
+        self.__dict__.pop("_cache", None)
 
     @property
     def sigmasq(self):
@@ -1084,11 +1434,17 @@ class AutoRegressiveDiagonalNoiseObservations(AutoRegressiveObservations):
 
     @property
     def Sigmas_init(self):
-        return np.array([np.diag(np.exp(log_s)) for log_s in self._log_sigmasq_init])
+        # broadcast the variances onto the diagonal rather than building
+        # K dense matrices in a Python loop
+        return self._get_cached(
+            "Sigmas_init",
+            lambda: np.exp(self._log_sigmasq_init)[:, :, None] * np.eye(self.D))
 
     @property
     def Sigmas(self):
-        return np.array([np.diag(np.exp(log_s)) for log_s in self._log_sigmasq])
+        return self._get_cached(
+            "Sigmas",
+            lambda: np.exp(self._log_sigmasq)[:, :, None] * np.eye(self.D))
 
     @Sigmas.setter
     def Sigmas(self, value):
@@ -1097,6 +1453,19 @@ class AutoRegressiveDiagonalNoiseObservations(AutoRegressiveObservations):
         assert np.all(sigmasq > 0)
         self._log_sigmasq = np.log(sigmasq)
 
+    @property
+    def _inv_Sigmas_init(self):
+        # diagonal covariances invert elementwise
+        return self._get_cached(
+            "inv_Sigmas_init",
+            lambda: np.exp(-self._log_sigmasq_init)[:, :, None] * np.eye(self.D))
+
+    @property
+    def _inv_Sigmas(self):
+        return self._get_cached(
+            "inv_Sigmas",
+            lambda: np.exp(-self._log_sigmasq)[:, :, None] * np.eye(self.D))
+
     @property
     def params(self):
         return super(AutoRegressiveObservations, self).params + (self._log_sigmasq,)
@@ -1115,23 +1484,13 @@ class AutoRegressiveDiagonalNoiseObservations(AutoRegressiveObservations):
         assert np.all(mask), "Cannot compute likelihood of autoregressive obsevations with missing data."
 
         L = self.lags
-        mus = self._compute_mus(data, input, mask, tag)
-
-        # Compute the likelihood of the initial data and remainder separately
-        # stats.multivariate_studentst_logpdf supports broadcasting, but we get
-        # significant performance benefit if we call it with (TxD), (D,), (D,D), and (,)
-        # arrays as inputs
-        ll_init = np.column_stack([stats.diagonal_gaussian_logpdf(data[:L], mu[:L], sigmasq)
-                               for mu, sigmasq in zip(mus, self.sigmasq_init)])
-
-        ll_ar = np.column_stack([stats.diagonal_gaussian_logpdf(data[L:], mu[L:], sigmasq)
-                               for mu, sigmasq in zip(mus, self.sigmasq)])
-
+        mus = np.swapaxes(self._compute_mus(data, input, mask, tag), 0, 1)
 
-        # Compute the likelihood of the initial data and remainder separately
-        # ll_init = stats.diagonal_gaussian_logpdf(data[:L, None, :], mus[:L], self.sigmasq_init)
-        # ll_ar = stats.diagonal_gaussian_logpdf(data[L:, None, :], mus[L:], self.sigmasq)
-        return np.row_stack((ll_init, ll_ar))
+        # Compute the likelihood of the initial data and remainder separately,
+        # broadcasting the diagonal Gaussian density over all K states at once
+        ll_init = stats.diagonal_gaussian_logpdf(data[:L, None, :], mus[:L], self.sigmasq_init)
+        ll_ar = stats.diagonal_gaussian_logpdf(data[L:, None, :], mus[L:], self.sigmasq)
+        return np.concatenate((ll_init, ll_ar))
 
 
 class IndependentAutoRegressiveObservations(_AutoRegressiveObservationsBase):
@@ -1193,30 +1552,40 @@ class IndependentAutoRegressiveObservations(_AutoRegressiveObservationsBase):
                 y = data[ts+self.lags, d:d+1]
                 lr = LinearRegression().fit(x, y)
 
-                self.As[k, d] = lr.coef_[:, :self.lags]
-                self.Vs[k, d] = lr.coef_[:, self.lags:self.lags+self.M]
-                self.bs[k, d] = lr.intercept_
+                self._As[k, d] = lr.coef_[0, :self.lags]
+                self.Vs[k, d] = lr.coef_[0, self.lags:self.lags+self.M]
+                self.bs[k, d] = lr.intercept_[0]
 
                 resid = y - lr.predict(x)
                 sigmas = np.var(resid, axis=0)
-                self._log_sigmasq[k, d] = np.log(sigmas + 1e-16)
+                self._log_sigmasq[k, d] = np.log(sigmas[0] + 1e-16)
 
     def _compute_mus(self, data, input, mask, tag):
         """
         Re-implement compute_mus for this class since we can do it much
-        more efficiently than in the general AR case.
+        more efficiently than in the general AR case.  The computation is
+        elementwise multiply-accumulate over the diagonal AR coefficients,
+        so it dispatches to a numba kernel when the parameters are plain
+        arrays; the broadcasting fallback keeps the autograd path working
+        when the parameters are being traced.
         """
         T, D = data.shape
-        As, bs, Vs = self.As, self.bs, self.Vs
+        As, bs, Vs = self._As, self.bs, self.Vs
 
-        # Instantaneous inputs, lagged data, and bias
-        mus = np.matmul(Vs[None, ...], input[self.lags:, None, :self.M, None])[:, :, :, 0]
-        for l in range(self.lags):
-            mus += As[:, :, l] * data[self.lags-l-1:-l-1, None, :]
-        mus += bs
+        if isinstance(As, numpy.ndarray) and isinstance(bs, numpy.ndarray) \
+                and isinstance(Vs, numpy.ndarray):
+            mus = _diagonal_ar_compute_mus(
+                data, numpy.ascontiguousarray(input[:, :self.M]),
+                As, bs, Vs, self.mu_init, self.lags)
+        else:
+            # Instantaneous inputs, lagged data, and bias
+            mus = np.matmul(Vs[None, ...], input[self.lags:, None, :self.M, None])[:, :, :, 0]
+            for l in range(self.lags):
+                mus = mus + As[:, :, l] * data[self.lags-l-1:-l-1, None, :]
+            mus = mus + bs
 
-        # Pad with the initial condition
-        mus = np.concatenate((self.mu_init * np.ones((self.lags, self.K, self.D)), mus))
+            # Pad with the initial condition
+            mus = np.concatenate((self.mu_init * np.ones((self.lags, self.K, self.D)), mus))
 
         assert mus.shape == (T, self.K, D)
         return mus
@@ -1228,7 +1597,7 @@ class IndependentAutoRegressiveObservations(_AutoRegressiveObservationsBase):
         L = self.lags
         ll_init = stats.diagonal_gaussian_logpdf(data[:L, None, :], mus[:L], self.sigmasq_init)
         ll_ar = stats.diagonal_gaussian_logpdf(data[L:, None, :], mus[L:], self.sigmasq)
-        return np.row_stack((ll_init, ll_ar))
+        return np.concatenate((ll_init, ll_ar))
 
     def m_step(self, expectations, datas, inputs, masks, tags, **kwargs):
         D, M = self.D, self.M
@@ -1251,32 +1620,39 @@ class IndependentAutoRegressiveObservations(_AutoRegressiveObservationsBase):
 
             # If there was no data for this dimension then skip it
             if len(xs) == 0:
-                self.As[:, d, :] = 0
+                self._As[:, d, :] = 0
                 self.Vs[:, d, :] = 0
                 self.bs[:, d] = 0
                 continue
 
-            # Otherwise, fit a weighted linear regression for each discrete state
+            # Accumulate the weighted least squares statistics for all states
+            # in one jitted pass over the data
+            Js, hs = _weighted_ar_statistics(xs, ys, weights)
+
+            # Fit a weighted linear regression for each discrete state
             for k in range(self.K):
                 # Check for zero weights (singular matrix)
                 if np.sum(weights[:, k]) < self.lags + M + 1:
-                    self.As[k, d] = 1.0
+                    self._As[k, d] = 1.0
                     self.Vs[k, d] = 0
                     self.bs[k, d] = 0
                     self._log_sigmasq[k, d] = 0
                     continue
 
-                # Solve for the most likely A,V,b (no prior)
-                Jk = np.sum(weights[:, k][:, None, None] * xs[:,:,None] * xs[:, None,:], axis=0)
-                hk = np.sum(weights[:, k][:, None] * xs * ys[:, None], axis=0)
-                muk = np.linalg.solve(Jk, hk)
+                # Solve for the most likely A,V,b (no prior).  J is SPD, so
+                # call the positive-definite LAPACK driver directly; for
+                # these small systems the np.linalg dispatch overhead
+                # dominates the actual solve.
+                _, muk, info = dposv(Js[k], hs[k], lower=1)
+                if info != 0:
+                    muk = np.linalg.solve(Js[k], hs[k])
 
-                self.As[k, d] = muk[:self.lags]
+                self._As[k, d] = muk[:self.lags]
                 self.Vs[k, d] = muk[self.lags:self.lags+M]
                 self.bs[k, d] = muk[-1]
 
                 # Update the variances
-                yhats = xs.dot(np.concatenate((self.As[k, d], self.Vs[k, d], [self.bs[k, d]])))
+                yhats = xs.dot(muk)
                 sqerr = (ys - yhats)**2
                 sigma = np.average(sqerr, weights=weights[:, k], axis=0) + 1e-16
                 self._log_sigmasq[k, d] = np.log(sigma)
@@ -1289,10 +1665,9 @@ class IndependentAutoRegressiveObservations(_AutoRegressiveObservationsBase):
             sigma_init = self.sigmasq_init[z] if with_noise else 0
             return self.mu_init[z] + np.sqrt(sigma_init) * npr.randn(D)
 
-        # Otherwise sample the AR model
-        muz = bs[z].copy()
-        for lag in range(self.lags):
-            muz += As[z, :, lag] * xhist[-lag - 1]
+        # Otherwise sample the AR model, contracting the diagonal AR
+        # coefficients against the lagged history in one vectorized op
+        muz = bs[z] + np.sum(self._As[z] * xhist[-self.lags:][::-1].T, axis=1)
 
         sigma = sigmas[z] if with_noise else 0
         return muz + np.sqrt(sigma) * npr.randn(D)
@@ -1358,11 +1733,16 @@ class _RobustAutoRegressiveObservationsMixin(object):
         # stats.multivariate_studentst_logpdf supports broadcasting, but we get
         # significant performance benefit if we call it with (TxD), (D,), (D,D), and (,)
         # arrays as inputs
-        ll_init = np.column_stack([stats.multivariate_normal_logpdf(data[:L], mu[:L], Sigma)
-                               for mu, Sigma in zip(mus, self.Sigmas_init)])
+        Ls_init = self._get_cached("chol_Sigmas_init",
+                                   lambda: np.linalg.cholesky(self.Sigmas_init))
+        Ls = self._get_cached("chol_Sigmas",
+                              lambda: np.linalg.cholesky(self.Sigmas))
 
-        ll_ar = np.column_stack([stats.multivariate_studentst_logpdf(data[L:], mu[L:], Sigma, nu)
-                               for mu, Sigma, nu in zip(mus, self.Sigmas, self.nus)])
+        ll_init = np.column_stack([stats._multivariate_normal_logpdf(data[:L], mu[:L], Sigma, Ls=Lc)
+                               for mu, Sigma, Lc in zip(mus, self.Sigmas_init, Ls_init)])
+
+        ll_ar = np.column_stack([stats.multivariate_studentst_logpdf(data[L:], mu[L:], Sigma, nu, Ls=Lc)
+                               for mu, Sigma, nu, Lc in zip(mus, self.Sigmas, self.nus, Ls)])
 
         return np.row_stack((ll_init, ll_ar))
 
@@ -1385,24 +1765,39 @@ class _RobustAutoRegressiveObservationsMixin(object):
             if not np.all(mask):
                 raise Exception("Encountered missing data in AutoRegressiveObservations!")
 
-            xs.append(
-                np.hstack([data[lags-l-1:-l-1] for l in range(lags)]
-                          + [input[lags:, :self.M], np.ones((data.shape[0]-lags, 1))]))
+            xs.append(self._design_matrix(data, input))
             ys.append(data[lags:])
             Ezs.append(Ez[lags:])
 
+        # Concatenate the datasets so each EM iteration reduces to a single
+        # contraction over one time axis.
+        x = np.concatenate(xs)
+        y = np.concatenate(ys)
+        Ez = np.concatenate(Ezs)
+
+        # Stack the AR parameters once; after each M step below the solved
+        # coefficients are written back into Afull directly instead of
+        # re-concatenating As, Vs, and bs every iteration.
+        Afull = np.concatenate((self.As, self.Vs, self.bs[:, :, None]), axis=2)
+
         for itr in range(num_em_iters):
-            # E Step: compute expected precision for each data point given current parameters
-            taus = []
-            for x, y in zip(xs, ys):
-                Afull = np.concatenate((self.As, self.Vs, self.bs[:, :, None]), axis=2)
-                mus = np.matmul(Afull[None, :, :, :], x[:, None, :, None])[:, :, :, 0]
-
-                # nu: (K,)  mus: (T, K, D)  sigmas: (K, D, D)  y: (T, D)  -> tau: (T, K)
-                alpha = self.nus / 2 + D/2
-                sqrt_Sigmas = np.linalg.cholesky(self.Sigmas)
-                beta = self.nus / 2 + 1/2 * stats.batch_mahalanobis(sqrt_Sigmas, y[:, None, :] - mus)
-                taus.append(alpha / beta)
+            # E Step: compute expected precision for each data point given
+            # current parameters, with one batched GEMM for the means
+            mus = np.matmul(x, np.swapaxes(Afull, 1, 2))
+
+            # nu: (K,)  mus: (K, T, D)  sigmas: (K, D, D)  y: (T, D)  -> tau: (T, K)
+            # The Mahalanobis term uses the cached Cholesky factors: one
+            # triangular inverse per state and a single batched contraction,
+            # rather than refactorizing the covariances on every inner
+            # EM iteration.
+            alpha = self.nus / 2 + D/2
+            Ls = self._get_cached("chol_Sigmas",
+                                  lambda: np.linalg.cholesky(self.Sigmas))
+            L_invs = self._get_cached("inv_chol_Sigmas",
+                                      lambda: np.array([np.linalg.inv(Lk) for Lk in Ls]))
+            u = np.einsum('kij,ktj->kti', L_invs, y[None, :, :] - mus, optimize=True)
+            beta = self.nus / 2 + 1/2 * np.swapaxes(np.sum(u**2, axis=2), 0, 1)
+            tau = alpha / beta
 
             # M step: Fit the weighted linear regressions for each K and D
             # This is exactly the same as the M-step for the AutoRegressiveObservations,
@@ -1411,38 +1806,37 @@ class _RobustAutoRegressiveObservationsMixin(object):
                 J_diag = np.concatenate((self.l2_penalty_A * np.ones(D * lags),
                                  self.l2_penalty_V * np.ones(M),
                                  self.l2_penalty_b * np.ones(1)))
-                J = np.tile(np.diag(J_diag)[None, :, :], (K, 1, 1))
-                h = np.zeros((K, D * lags + M + 1, D))
+                # write the penalties straight onto the diagonals rather than
+                # tiling K dense copies of a mostly-zero matrix
+                P = D * lags + M + 1
+                J = np.zeros((K, P, P))
+                J[:, np.arange(P), np.arange(P)] = J_diag
+                h = np.zeros((K, P, D))
             else:
                 assert J0.shape == (K, D*lags + M + 1, D*lags + M + 1)
                 assert h0.shape == (K, D*lags + M + 1, D)
                 J = J0
                 h = h0
 
-            for x, y, Ez, tau in zip(xs, ys, Ezs, taus):
-                weight = Ez * tau
-                # Einsum is concise but slow!
-                # J += np.einsum('tk, ti, tj -> kij', weight, x, x)
-                # h += np.einsum('tk, ti, td -> kid', weight, x, y)
-                # Do weighted products for each of the k states
-                for k in range(K):
-                    weighted_x = x * weight[:, k:k+1]
-                    J[k] += np.dot(weighted_x.T, x)
-                    h[k] += np.dot(weighted_x.T, y)
-
-            mus = np.linalg.solve(J, h)
-            self.As = np.swapaxes(mus[:, :D*lags, :], 1, 2)
-            self.Vs = np.swapaxes(mus[:, D*lags:D*lags+M, :], 1, 2)
-            self.bs = mus[:, -1, :]
-
-            # Update the covariance
-            sqerr = np.zeros((K, D, D))
-            weight = np.zeros(K)
-            for x, y, Ez, tau in zip(xs, ys, Ezs, taus):
-                yhat = np.matmul(x[None, :, :], mus)
-                resid = y[None, :, :] - yhat
-                sqerr += np.einsum('tk,kti,ktj->kij', Ez * tau, resid, resid)
-                weight += np.sum(Ez, axis=0)
+            weight = Ez * tau
+            # The symmetric Gram accumulation does half the flops via dsyrk;
+            # with optimize=True the h contraction reduces to a GEMM.
+            J = J + _symmetric_weighted_gram(x, weight)
+            h = h + np.einsum('tk,ti,td->kid', weight, x, y, optimize=True)
+
+            # J is SPD by construction, so solve with Cholesky factorizations
+            mus = np.array([cho_solve(cho_factor(Jk, lower=True), hk)
+                            for Jk, hk in zip(J, h)])
+            Afull = np.swapaxes(mus, 1, 2)
+            self.As = Afull[:, :, :D*lags]
+            self.Vs = Afull[:, :, D*lags:D*lags+M]
+            self.bs = Afull[:, :, -1]
+
+            # Update the covariance with a batched GEMM over the weighted residuals
+            yhat = np.matmul(x, mus)
+            resid = y[None, :, :] - yhat
+            sqerr = np.matmul(np.swapaxes(resid * (Ez * tau).T[:, :, None], 1, 2), resid)
+            weight = np.sum(Ez, axis=0)
 
             self.Sigmas = sqerr / weight[:, None, None] + 1e-8 * np.eye(D)
 
@@ -1455,39 +1849,92 @@ class _RobustAutoRegressiveObservationsMixin(object):
         E_taus = np.zeros(K)
         E_logtaus = np.zeros(K)
         weights = np.zeros(K)
+
+        # The parameters are fixed over the dataset loop, so factorize the
+        # covariances (via the shared cache) and evaluate alpha and its
+        # digamma once up front
+        half_nus = self.nus / 2
+        alpha = half_nus + D/2
+        digamma_alpha = digamma(alpha)
+        sqrt_Sigma = self._get_cached("chol_Sigmas",
+                                      lambda: np.linalg.cholesky(self.Sigmas))
         for (Ez, _, _,), data, input, mask, tag in zip(expectations, datas, inputs, masks, tags):
             # nu: (K,)  mus: (T, K, D)  Sigmas: (K, D, D)  y: (T, D)  -> tau: (T, K)
             mus = np.swapaxes(self._compute_mus(data, input, mask, tag), 0, 1)
 
-            alpha = self.nus/2 + D/2
-            sqrt_Sigma = np.linalg.cholesky(self.Sigmas)
-            # TODO: Performance could be improved by iterating over K outside batch_mahalanobis
-            beta = self.nus/2 + 1/2 * stats.batch_mahalanobis(sqrt_Sigma, data[L:, None, :] - mus[L:])
+            # Iterate over K so each Mahalanobis term hits the contiguous
+            # (T, D)-by-(D, D) fast path in batch_mahalanobis — one
+            # triangular solve over the time dimension per state instead of a
+            # generalized batched solve on interleaved memory
+            mahal = np.column_stack(
+                [stats.batch_mahalanobis(sqrt_Sigma[k], data[L:] - mus[L:, k])
+                 for k in range(K)])
+            beta = half_nus + 1/2 * mahal
 
             E_taus += np.sum(Ez[L:, :] * alpha / beta, axis=0)
-            E_logtaus += np.sum(Ez[L:, :] * (digamma(alpha) - np.log(beta)), axis=0)
+            E_logtaus += np.sum(Ez[L:, :] * (digamma_alpha - np.log(beta)), axis=0)
             weights += np.sum(Ez, axis=0)
 
         E_taus /= weights
         E_logtaus /= weights
 
-        for k in range(K):
-            self._log_nus[k] = np.log(generalized_newton_studentst_dof(E_taus[k], E_logtaus[k]))
+        # One batched Newton iteration over all states at once
+        self._log_nus = np.log(generalized_newton_studentst_dof_batched(E_taus, E_logtaus))
 
     def sample_x(self, z, xhist, input=None, tag=None, with_noise=True):
-        D, As, bs, Vs, Sigmas, nus = self.D, self.As, self.bs, self.Vs, self.Sigmas, self.nus
+        D, As, bs, Vs, nus = self.D, self.As, self.bs, self.Vs, self.nus
         if xhist.shape[0] < self.lags:
-            S = np.linalg.cholesky(self.Sigmas_init[z]) if with_noise else 0
+            if with_noise:
+                S = self._get_cached("chol_Sigmas_init",
+                                     lambda: np.linalg.cholesky(self.Sigmas_init))[z]
+            else:
+                S = 0
             return self.mu_init[z] + np.dot(S, npr.randn(D))
         else:
-            mu = Vs[z].dot(input[:self.M]) + bs[z]
-            for l in range(self.lags):
-                mu += As[z][:,l*D:(l+1)*D].dot(xhist[-l-1])
+            mu = Vs[z].dot(input[:self.M]) + bs[z] \
+                + As[z].dot(xhist[-self.lags:][::-1].ravel())
 
+            # chol(Sigma / tau) = chol(Sigma) / sqrt(tau) for scalar tau, so
+            # the cached per-state factor can be rescaled instead of
+            # refactorizing on every draw
             tau = npr.gamma(nus[z] / 2.0, 2.0 / nus[z])
-            S = np.linalg.cholesky(Sigmas[z] / tau) if with_noise else 0
+            if with_noise:
+                S = self._get_cached("chol_Sigmas",
+                                     lambda: np.linalg.cholesky(self.Sigmas))[z] / np.sqrt(tau)
+            else:
+                S = 0
             return mu + np.dot(S, npr.randn(D))
 
+    def sample_x_batch(self, zs, xhist, input=None, tag=None, with_noise=True):
+        """
+        As in the parent class, but with Student's t noise: the gamma scale
+        mixture variables for the whole trajectory are also drawn in one
+        block RNG call.
+        """
+        T = len(zs)
+        D, As, bs, Vs, L = self.D, self.As, self.bs, self.Vs, self.lags
+        input = np.zeros((T, self.M)) if input is None else input
+
+        if with_noise:
+            S_init = self._get_cached("chol_Sigmas_init",
+                                      lambda: np.linalg.cholesky(self.Sigmas_init))
+            S = self._get_cached("chol_Sigmas",
+                                 lambda: np.linalg.cholesky(self.Sigmas))
+            nus = self.nus[zs]
+            scale = 1 / np.sqrt(npr.gamma(nus / 2.0, 2.0 / nus))
+            noise = npr.randn(T, D)
+        else:
+            S_init = S = numpy.zeros((self.K, D, D))
+            scale = numpy.ones(T)
+            noise = numpy.zeros((T, D))
+
+        pad = xhist.shape[0]
+        xs = np.concatenate((xhist, np.zeros((T, D))))
+        _ar_sample_trajectory(
+            numpy.asarray(zs), xs, numpy.ascontiguousarray(input[:, :self.M]),
+            As, Vs, bs, self.mu_init, S_init, S, noise, scale, pad, L)
+        return xs[pad:]
+
 
 class RobustAutoRegressiveObservations(_RobustAutoRegressiveObservationsMixin, AutoRegressiveObservations):
     """
@@ -1604,33 +2051,41 @@ class AltRobustAutoRegressiveDiagonalNoiseObservations(AutoRegressiveDiagonalNoi
             if not np.all(mask):
                 raise Exception("Encountered missing data in AutoRegressiveObservations!")
 
-            xs.append(
-                np.hstack([data[lags-l-1:-l-1] for l in range(lags)]
-                          + [input[lags:, :self.M], np.ones((data.shape[0]-lags, 1))]))
+            xs.append(self._design_matrix(data, input))
             ys.append(data[lags:])
             Ezs.append(Ez[lags:])
 
-        for itr in range(num_em_iters):
-            # E Step: compute expected precision for each data point given current parameters
-            taus = []
-            for x, y in zip(xs, ys):
-                # mus = self._compute_mus(data, input, mask, tag)
-                # sigmas = self._compute_sigmas(data, input, mask, tag)
-                Afull = np.concatenate((self.As, self.Vs, self.bs[:, :, None]), axis=2)
-                mus = np.matmul(Afull[None, :, :, :], x[:, None, :, None])[:, :, :, 0]
-
-                # nu: (K,D)  mus: (T, K, D)  sigmas: (K, D)  y: (T, D)  -> tau: (T, K, D)
-                alpha = self.nus / 2 + 1/2
-                beta = self.nus / 2 + 1/2 * (y[:, None, :] - mus)**2 / self.sigmasq
-                taus.append(alpha / beta)
+        # Stack the AR parameters once up front; each M step below hands the
+        # solved coefficient array straight back as the next Afull
+        Afull = np.concatenate((self.As, self.Vs, self.bs[:, :, None]), axis=2)
+        nus = self.nus
 
-            # M step: Fit the weighted linear regressions for each K and D
-            J = np.tile(np.eye(D * lags + M + 1)[None, None, :, :], (K, D, 1, 1))
-            h = np.zeros((K, D,  D*lags + M + 1,))
+        for itr in range(num_em_iters):
+            # E Step: compute expected precision for each data point given
+            # current parameters.  The jitted kernel fuses the mean, alpha,
+            # and beta computations into a single pass over the data.
+            sigmasq = self.sigmasq
+            taus = [_alt_robust_expected_tau(x, y, Afull, sigmasq, nus)
+                    for x, y in zip(xs, ys)]
+
+            # M step: Fit the weighted linear regressions for each K and D.
+            # Write the identity prior onto the diagonals of a zeroed buffer
+            # rather than tiling K * D dense copies of eye through a
+            # temporary.
+            P = D * lags + M + 1
+            J = np.zeros((K, D, P, P))
+            J[:, :, np.arange(P), np.arange(P)] = 1.0
+            h = np.zeros((K, D, P))
             for x, y, Ez, tau in zip(xs, ys, Ezs, taus):
                 robust_ar_statistics(Ez, tau, x, y, J, h)
 
-            mus = np.linalg.solve(J, h)
+            # J is SPD by construction (weighted Gram plus identity prior),
+            # so solve with Cholesky factorizations.  This also keeps the
+            # vector right-hand-side semantics that np.linalg.solve no
+            # longer applies to stacked systems.
+            mus = np.array([[cho_solve(cho_factor(J[k, d], lower=True), h[k, d])
+                             for d in range(D)] for k in range(K)])
+            Afull = mus
             self.As = mus[:, :, :D*lags]
             self.Vs = mus[:, :, D*lags:D*lags+M]
             self.bs = mus[:, :, -1]
@@ -1639,33 +2094,52 @@ class AltRobustAutoRegressiveDiagonalNoiseObservations(AutoRegressiveDiagonalNoi
             sqerr = 0
             weight = 0
             for x, y, Ez, tau in zip(xs, ys, Ezs, taus):
-                yhat = np.matmul(x[None, :, :], np.swapaxes(mus, -1, -2))
-                sqerr += np.einsum('tk, tkd, ktd -> kd', Ez, tau, (y - yhat)**2)
+                # Contract the design matrix against the coefficients
+                # directly into (T, K, D) so the residuals line up with tau
+                # without transposing a batched matmul result
+                yhat = np.einsum('tp, kdp -> tkd', x, mus, optimize=True)
+                # optimize=True lets einsum pick a pairwise contraction path
+                # (dispatching to batched matmul) instead of the naive
+                # four-index loop over the operands.  Supplying the residual
+                # twice folds the square into the contraction, so no
+                # (T, K, D) squared-error temporary is materialized.
+                r = y[:, None, :] - yhat
+                sqerr += np.einsum('tk, tkd, tkd, tkd -> kd', Ez, tau, r, r,
+                                   optimize=True)
                 weight += np.sum(Ez, axis=0)
-            self._log_sigmasq = np.log(sqerr / weight[:, None] + 1e-16)
+
+            # Finish the variance update in place: sqerr is a freshly
+            # accumulated (K, D) array, so normalize, floor, and log it
+            # without allocating three more temporaries
+            numpy.divide(sqerr, weight[:, None], out=sqerr)
+            numpy.add(sqerr, 1e-16, out=sqerr)
+            self._log_sigmasq = numpy.log(sqerr, out=sqerr)
 
     def _m_step_nu(self, expectations, datas, inputs, masks, tags, optimizer, num_iters, **kwargs):
         K, D, L = self.K, self.D, self.lags
         E_taus = np.zeros((K, D))
         E_logtaus = np.zeros((K, D))
         weights = np.zeros(K)
+        half_nus = self.nus / 2
+        inv_sigmasq = 1 / self.sigmasq
+        digamma_alpha = digamma(half_nus + 1/2)
         for (Ez, _, _,), data, input, mask, tag in zip(expectations, datas, inputs, masks, tags):
             # nu: (K,D)  mus: (T, K, D)  sigmas: (K, D)  y: (T, D)  -> w: (T, K, D)
             mus = np.swapaxes(self._compute_mus(data, input, mask, tag), 0, 1)
 
-            alpha = self.nus/2 + 1/2
-            beta = self.nus/2 + 1/2 * (data[L:, None, :] - mus[L:])**2 / self.sigmasq
-
-            E_taus += np.sum(Ez[L:, :, None] * alpha / beta, axis=0)
-            E_logtaus += np.sum(Ez[L:, :, None] * (digamma(alpha) - np.log(beta)), axis=0)
+            # One fused pass accumulates both statistics without
+            # materializing beta
+            E_tau, E_logtau = _alt_robust_nu_statistics(
+                Ez[L:], data[L:], mus[L:], half_nus, inv_sigmasq, digamma_alpha)
+            E_taus += E_tau
+            E_logtaus += E_logtau
             weights += np.sum(Ez, axis=0)
 
         E_taus /= weights[:, None]
         E_logtaus /= weights[:, None]
 
-        for k in range(K):
-            for d in range(D):
-                self._log_nus[k, d] = np.log(generalized_newton_studentst_dof(E_taus[k, d], E_logtaus[k, d]))
+        # One batched Newton iteration over all (k, d) entries at once
+        self._log_nus = np.log(generalized_newton_studentst_dof_batched(E_taus, E_logtaus))
 
     def sample_x(self, z, xhist, input=None, tag=None, with_noise=True):
         D, As, bs, sigmasq, nus = self.D, self.As, self.bs, self.sigmasq, self.nus
@@ -1673,14 +2147,42 @@ class AltRobustAutoRegressiveDiagonalNoiseObservations(AutoRegressiveDiagonalNoi
             sigma_init = self.sigmasq_init[z] if with_noise else 0
             return self.mu_init[z] + np.sqrt(sigma_init) * npr.randn(D)
         else:
-            mu = bs[z].copy()
-            for l in range(self.lags):
-                mu += As[z][:,l*D:(l+1)*D].dot(xhist[-l-1])
+            mu = bs[z] + As[z].dot(xhist[-self.lags:][::-1].ravel())
 
             tau = npr.gamma(nus[z] / 2.0, 2.0 / nus[z])
             var = sigmasq[z] / tau if with_noise else 0
             return mu + np.sqrt(var) * npr.randn(D)
 
+    def sample_x_batch(self, zs, xhist, input=None, tag=None, with_noise=True):
+        """
+        Sample a trajectory for a fixed state sequence, drawing the per-
+        dimension gamma scales and the normals for the whole rollout in two
+        block RNG calls.  The noise is diagonal, so it is pre-scaled per
+        step and dimension and the recursion runs through the same jitted
+        kernel as the dense AR samplers (with identity noise rotations).
+        """
+        T = len(zs)
+        D, As, bs, L = self.D, self.As, self.bs, self.lags
+        zs = numpy.asarray(zs)
+        pad = xhist.shape[0]
+
+        if with_noise:
+            nus = self.nus[zs]
+            sigma = np.sqrt(self.sigmasq[zs] / npr.gamma(nus / 2.0, 2.0 / nus))
+            init_steps = pad + np.arange(T) < L
+            if init_steps.any():
+                sigma[init_steps] = np.sqrt(self.sigmasq_init[zs[init_steps]])
+            noise = sigma * npr.randn(T, D)
+        else:
+            noise = numpy.zeros((T, D))
+
+        eye = numpy.tile(numpy.eye(D), (self.K, 1, 1))
+        xs = np.concatenate((xhist, np.zeros((T, D))))
+        _ar_sample_trajectory(
+            zs, xs, numpy.zeros((T, 0)), As, self.Vs, bs, self.mu_init,
+            eye, eye, noise, numpy.ones(T), pad, L)
+        return xs[pad:]
+
 
 class VonMisesObservations(Observations):
     def __init__(self, K, D, M=0):
@@ -482,6 +482,55 @@ def generalized_newton_studentst_dof(E_tau, E_logtau, nu0=2, a_nu=3, b_nu=3/2,
     return nu
 
 
+def generalized_newton_studentst_dof_batched(E_tau, E_logtau, nu0=2, a_nu=3, b_nu=3/2,
+                                             max_iter=100, nu_min=1e-8, nu_max=100, tol=1e-8):
+    """
+    Vectorized form of :func:`generalized_newton_studentst_dof` that runs the
+    generalized Newton iteration on whole arrays of expected statistics at
+    once, avoiding a Python-level call per entry.  Entries converge (or hit
+    the bounds) independently; converged entries are frozen while the rest
+    keep iterating.
+    """
+    assert a_nu > 1, "Gamma prior nu ~ Ga(a_nu, b_nu) must be log concave; i.e. a_nu must be > 1."
+    E_tau = np.asarray(E_tau, dtype=float)
+    E_logtau = np.asarray(E_logtau, dtype=float)
+
+    delbo = lambda nu: 1/2 * (1 + np.log(nu/2)) - 1/2 * digamma(nu/2) \
+            + 1/2 * E_logtau - 1/2 * E_tau + (a_nu - 1) / nu - b_nu
+    ddelbo = lambda nu: 1/(2 * nu) - 1/4 * polygamma(1, nu/2) + (1 - a_nu) / nu**2
+
+    nu = np.full(E_tau.shape, float(nu0))
+    active = np.ones(E_tau.shape, dtype=bool)
+    for itr in range(max_iter):
+        if not np.any(active):
+            break
+
+        out_of_bounds = active & ((nu < nu_min) | (nu > nu_max))
+        if np.any(out_of_bounds):
+            warn("generalized_newton_studentst_dof fixed point grew beyond "
+                 "bounds [{},{}].".format(nu_min, nu_max))
+            nu = np.clip(nu, nu_min, nu_max)
+            active = active & ~out_of_bounds
+            if not np.any(active):
+                break
+
+        # Perform the generalized Newton update on the active entries
+        a = -nu**2 * ddelbo(nu)
+        b = delbo(nu) - a / nu
+        assert np.all(a[active] > 0) and np.all(b[active] < 0), \
+               "generalized_newton_studentst_dof failed due to nonconcave optimization. \
+               Try strengthening prior via parameters a_nu and b_nu."
+        dnu = np.where(active, -a / b - nu, 0)
+        nu = nu + dnu
+        active = active & (np.abs(dnu) >= tol)
+
+    if itr == max_iter - 1:
+        warn("generalized_newton_studentst_dof failed to converge"
+             "at tolerance {} in {} iterations.".format(tol, itr))
+
+    return nu
+
+
 def fit_negative_binomial_integer_r(xs, r_min=1, r_max=20):
     """
     Fit a negative binomial distribution NB(r, p) to data xs,
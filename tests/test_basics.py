@@ -69,6 +69,120 @@ def test_sample(T=10, K=4, D=3, M=2):
             zsmpl, xsmpl = hmm.sample(T, prefix=(zpre, xpre), input=npr.randn(T, M), with_noise=False)
 
 
+def test_sample_x_batch_matches_sequential(T=20, K=3, D=2, M=1):
+    """
+    Test that the batched AR rollouts agree with the per-step samplers.
+    With the noise turned off the recursion is deterministic, so the
+    batched trajectory must reproduce the sequential one exactly.
+    """
+    from ssm.observations import \
+        AutoRegressiveObservations, \
+        RobustAutoRegressiveObservations, \
+        AltRobustAutoRegressiveDiagonalNoiseObservations
+
+    npr.seed(0)
+    observation_classes = [
+        AutoRegressiveObservations,
+        RobustAutoRegressiveObservations,
+        AltRobustAutoRegressiveDiagonalNoiseObservations
+    ]
+
+    for observation_class in observation_classes:
+        for lags in [1, 2]:
+            observations = observation_class(K, D, M=M, lags=lags)
+            zs = npr.randint(K, size=T)
+            input = npr.randn(T, M)
+            xhist = npr.randn(1, D)
+
+            xs = np.concatenate((xhist, np.zeros((T, D))))
+            for t in range(T):
+                xs[1+t] = observations.sample_x(
+                    zs[t], xs[:1+t], input=input[t], with_noise=False)
+            xs_batch = observations.sample_x_batch(
+                zs, xhist, input=input, with_noise=False)
+            assert np.allclose(xs_batch, xs[1:])
+
+            # With noise the draws differ, but they must be finite
+            xs_batch = observations.sample_x_batch(
+                zs, xhist, input=input, with_noise=True)
+            assert np.all(np.isfinite(xs_batch))
+
+
+def test_sample_batch_rollout(T=50, K=3, D=2, M=1):
+    """
+    Test the batched rollout path through HMM.sample.  The noise-free
+    sample must be reproducible from its own state path through the
+    sequential per-step sampler, and models that do not support the fast
+    path must fall back on the sequential sampler.
+    """
+    npr.seed(0)
+    for transitions in ["standard", "sticky", "inputdriven"]:
+        for observations in ["ar", "robust_ar"]:
+            hmm = ssm.HMM(K, D, M=M, transitions=transitions, observations=observations)
+            input = npr.randn(T, M)
+            z, x = hmm.sample(T, input=input, with_noise=False, batch_rollout=True)
+            for t in range(1, T):
+                xt = hmm.observations.sample_x(
+                    z[t], x[:t], input=input[t], with_noise=False)
+                assert np.allclose(x[t], xt)
+
+    # Recurrent transitions depend on the data, so the fast path must not
+    # engage: with a fixed seed the fallback matches the sequential sampler
+    hmm = ssm.HMM(K, D, M=M, transitions="recurrent", observations="ar")
+    input = npr.randn(T, M)
+    npr.seed(42)
+    z1, x1 = hmm.sample(T, input=input)
+    npr.seed(42)
+    z2, x2 = hmm.sample(T, input=input, batch_rollout=True)
+    assert np.all(z1 == z2) and np.allclose(x1, x2)
+
+    # Observations without sample_x_batch must fall back too
+    hmm = ssm.HMM(K, D, transitions="standard", observations="gaussian")
+    npr.seed(42)
+    z1, x1 = hmm.sample(T)
+    npr.seed(42)
+    z2, x2 = hmm.sample(T, batch_rollout=True)
+    assert np.all(z1 == z2) and np.allclose(x1, x2)
+
+
+def test_independent_ar_m_step(T=100, K=3, D=2, M=1, lags=2):
+    """
+    Regression test for the IndependentAutoRegressiveObservations m-step.
+    The update solves a weighted least squares problem per state and
+    dimension, so the fitted coefficients must match a hand-rolled
+    np.linalg.solve on the same normal equations.
+    """
+    from ssm.observations import IndependentAutoRegressiveObservations
+
+    npr.seed(0)
+    observations = IndependentAutoRegressiveObservations(K, D, M=M, lags=lags)
+
+    data = npr.randn(T, D)
+    input = npr.randn(T, M)
+    mask = np.ones((T, D), dtype=bool)
+    Ez = npr.dirichlet(np.ones(K), size=T)
+    expectations = [(Ez, None, None)]
+
+    observations.m_step(expectations, [data], [input], [mask], [None])
+
+    for d in range(D):
+        x = np.hstack([data[lags-l-1:-l-1, d:d+1] for l in range(lags)]
+                      + [input[lags:], np.ones((T-lags, 1))])
+        y = data[lags:, d]
+        for k in range(K):
+            w = Ez[lags:, k]
+            J = (x * w[:, None]).T.dot(x)
+            h = (x * w[:, None]).T.dot(y)
+            mu = np.linalg.solve(J, h)
+            assert np.allclose(observations._As[k, d], mu[:lags])
+            assert np.allclose(observations.Vs[k, d], mu[lags:lags+M])
+            assert np.allclose(observations.bs[k, d], mu[-1])
+
+            sqerr = (y - x.dot(mu))**2
+            sigma = np.average(sqerr, weights=w) + 1e-16
+            assert np.allclose(observations.sigmasq[k, d], sigma)
+
+
 def test_constrained_hmm(T=100, K=3, D=3):
     hmm = ssm.HMM(K, D, M=0, 
                   transitions="constrained",